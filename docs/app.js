@@ -4,6 +4,13 @@ async function loadJson(path){
   return res.json();
 }
 
+async function loadNdjson(path){
+  const res = await fetch(path, {cache: "no-store"});
+  if(!res.ok) throw new Error(`Failed to load ${path}`);
+  const text = await res.text();
+  return text.split("\n").filter(line => line.trim()).map(line => JSON.parse(line));
+}
+
 function fmtDate(iso){
   try{
     const d = new Date(iso);
@@ -85,7 +92,7 @@ async function main(){
   try{
     const [summary, posts] = await Promise.all([
       loadJson("../data/summary.json"),
-      loadJson("../data/posts.json")
+      loadNdjson("../data/posts.ndjson")
     ]);
     subredditLine.textContent = `Tracking r/${summary.subreddit} · data updated ${fmtDate(summary.generated_at_utc)}`;
     renderSummary(summary);
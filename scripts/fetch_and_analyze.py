@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Fetch latest Reddit posts and generate:
-- data/posts.json  (latest posts with sentiment 1-5 + extracted "requested items")
+- data/posts.ndjson (latest posts, one JSON object per line, with sentiment 1-5 + extracted "requested items")
 - data/wordfreq.json (top items/phrases for word cloud)
 - data/summary.json (aggregate stats)
 
@@ -14,21 +14,78 @@ from __future__ import annotations
 
 import os
 import json
+import asyncio
+import argparse
 import time
 import math
 import re
-from dataclasses import dataclass
+import string
+import functools
+import hashlib
+from collections import Counter
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
+try:
+    import tiktoken
+except ImportError:  # optional; fall back to character truncation
+    tiktoken = None
+
 # OpenAI SDK
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 UA = "codm-sentiment-tracker/1.0 (github-pages; contact: you@example.com)"
 
+# One keep-alive session for all Reddit pages; retries throttling/5xx with backoff.
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = UA
+SESSION.mount(
+    "https://",
+    HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])),
+)
+
+# Compiled once; these run for every post.
+_RE_URL = re.compile(r"https?://\S+", re.IGNORECASE)
+_RE_WS = re.compile(r"\s+")
+_RE_ITEM_SAN = re.compile(r"[^\w\s\-\+&'/]")
+
+_TOKEN_CHARS = frozenset(string.ascii_lowercase + string.digits + "-+&'/")
+
+
+class _TokenTable(dict):
+    """
+    str.translate table: token chars map to themselves, everything else
+    (punctuation, whitespace, non-ASCII) to a space. Filled lazily.
+    """
+
+    def __missing__(self, code: int) -> int:
+        out = code if chr(code) in _TOKEN_CHARS else 32
+        self[code] = out
+        return out
+
+
+_XLAT = _TokenTable()
+
+# Keyword extraction stopwords
+_STOPWORDS = frozenset("""
+    the a an and or but if then else when while to of in on for with without is are was were be been being
+    i you he she they we it this that these those my your our their
+    codm cod mobile call duty callofdutymobile
+    pls please thanks thank
+    just like game gameplay player players
+    really very much
+""".split())
+
 
 def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
@@ -41,22 +98,53 @@ def _safe_int(x: Any, default: int) -> int:
         return default
 
 
+def _json_loads(s: Any) -> Any:
+    return orjson.loads(s) if orjson is not None else json.loads(s)
+
+
+def _json_dumpb(obj: Any) -> bytes:
+    """
+    Compact single-line UTF-8 JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=8192)
 def _clean_text(s: str) -> str:
     s = s or ""
     # Remove URLs and excessive whitespace
-    s = re.sub(r"https?://\S+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _RE_URL.sub(" ", s)
+    s = _RE_WS.sub(" ", s).strip()
     return s
 
 
-def fetch_reddit_new(subreddit: str, limit: int = 50) -> List[Dict[str, Any]]:
+def _load_etags(path: str) -> Dict[str, str]:
+    try:
+        with open(path, "rb") as f:
+            etags = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return etags if isinstance(etags, dict) else {}
+
+
+def fetch_reddit_new(subreddit: str, limit: int = 50, data_dir: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Fetch posts from /new.json, paginating until 'limit' posts are collected.
+
+    With data_dir, each page's ETag (data_dir/.reddit_etag.json) and body
+    (data_dir/.cache/) are kept between runs and sent back as If-None-Match;
+    a 304 reuses the stored body instead of downloading it again.
     """
     posts: List[Dict[str, Any]] = []
     after = None
     base = f"https://www.reddit.com/r/{subreddit}/new.json"
-    headers = {"User-Agent": UA}
+    etag_path = os.path.join(data_dir, ".reddit_etag.json") if data_dir else ""
+    etags = _load_etags(etag_path) if etag_path else {}
+    # page keys requested this run; anything else is pruned at the end
+    # ('after' cursors change every run, so old pages never match again)
+    seen: Dict[str, str] = {}
 
     while len(posts) < limit:
         remaining = limit - len(posts)
@@ -66,9 +154,28 @@ def fetch_reddit_new(subreddit: str, limit: int = 50) -> List[Dict[str, Any]]:
         if after:
             params["after"] = after
 
-        resp = requests.get(base, headers=headers, params=params, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
+        headers = {}
+        page_path = ""
+        if data_dir:
+            key = f"{subreddit}|{page_limit}|{after or ''}"
+            page_path = os.path.join(data_dir, ".cache", hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+            seen[key] = os.path.basename(page_path)
+            if key in etags and os.path.exists(page_path):
+                headers["If-None-Match"] = etags[key]
+
+        resp = SESSION.get(base, params=params, headers=headers, timeout=30)
+        if resp.status_code == 304 and page_path:
+            with open(page_path, "rb") as f:
+                data = _json_loads(f.read())
+        else:
+            resp.raise_for_status()
+            data = resp.json()
+            etag = resp.headers.get("ETag")
+            if page_path and etag:
+                os.makedirs(os.path.dirname(page_path), exist_ok=True)
+                with open(page_path, "wb") as f:
+                    f.write(resp.content)
+                etags[key] = etag
 
         children = data.get("data", {}).get("children", [])
         if not children:
@@ -83,8 +190,18 @@ def fetch_reddit_new(subreddit: str, limit: int = 50) -> List[Dict[str, Any]]:
         if not after:
             break
 
-        # be gentle
-        time.sleep(1.0)
+        # be gentle (only when another page follows)
+        if len(posts) < limit:
+            time.sleep(0.3)
+
+    if etag_path:
+        cache_dir = os.path.join(data_dir, ".cache")
+        keep = set(seen.values())
+        if os.path.isdir(cache_dir):
+            for name in os.listdir(cache_dir):
+                if name not in keep:
+                    os.remove(os.path.join(cache_dir, name))
+        write_json(etag_path, {k: v for k, v in etags.items() if k in seen})
 
     return posts[:limit]
 
@@ -92,199 +209,496 @@ def fetch_reddit_new(subreddit: str, limit: int = 50) -> List[Dict[str, Any]]:
 def filter_by_age(posts: List[Dict[str, Any]], max_age_hours: Optional[int]) -> List[Dict[str, Any]]:
     if not max_age_hours:
         return posts
-    cutoff = _now_utc() - timedelta(hours=max_age_hours)
-    out = []
-    for p in posts:
-        created_utc = p.get("created_utc")
-        if created_utc is None:
+    # created_utc is epoch seconds; compare as floats
+    cutoff_ts = (_now_utc() - timedelta(hours=max_age_hours)).timestamp()
+    return [
+        p for p in posts
+        if p.get("created_utc") is not None and float(p["created_utc"]) >= cutoff_ts
+    ]
+
+
+# Keep costs sane: we only send title + first N tokens of body
+MAX_BODY_TOKENS = 400
+# ...or first N chars when no tokenizer is available
+MAX_BODY_CHARS = 1200
+# Posts per OpenAI request
+BATCH_SIZE = 20
+# Small tier is plenty for 1-5 scoring; override with OPENAI_MODEL
+DEFAULT_MODEL = "gpt-4o-mini"
+# Model families that offer the (cheaper, slower) flex service tier
+FLEX_MODEL_PREFIXES = ("gpt-5", "o3", "o4-mini")
+# Reasoning model families: their reasoning tokens count against max_output_tokens
+REASONING_MODEL_PREFIXES = ("gpt-5", "o1", "o3", "o4")
+# Extra output budget per request for those models' reasoning
+REASONING_TOKENS = 2048
+
+# Output shape is enforced by RESULTS_SCHEMA, so the prompt only covers meaning.
+SYSTEM_PROMPT = (
+    "Score each CoDM Reddit post (keep its idx). "
+    "sentiment_1_5: 1=very negative..5=very positive; sentiment_reason: <=20 words; "
+    "requested_items: 0-5 short phrases the author asks to buff/nerf/add/remove/fix, "
+    "else main items discussed (maps, guns, operators, perks, modes, bugs)."
+)
+
+# Structured output schema: the model must return exactly this shape.
+# Only core keywords; ranges/lengths are enforced by _sanitize_eval.
+RESULTS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "idx": {"type": "integer"},
+                    "sentiment_1_5": {"type": "integer"},
+                    "sentiment_reason": {"type": "string"},
+                    "requested_items": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["idx", "sentiment_1_5", "sentiment_reason", "requested_items"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["results"],
+    "additionalProperties": False,
+}
+
+# Reasons recorded when the model gave us nothing usable; never reused from cache.
+FALLBACK_REASONS = frozenset({"JSON parse error."})
+
+Evaluation = Tuple[int, str, List[str]]
+Chunk = List[Tuple[int, str, str]]
+
+
+def _sanitize_eval(obj: Dict[str, Any]) -> Evaluation:
+    """
+    Clamp/clean one model evaluation into (sentiment, reason, items).
+    """
+    sentiment = _safe_int(obj.get("sentiment_1_5"), 3)
+    sentiment = max(1, min(5, sentiment))
+    reason = str(obj.get("sentiment_reason", "")).strip()[:200]
+    items = obj.get("requested_items", [])
+    if not isinstance(items, list):
+        items = []
+    # sanitize phrases
+    clean_items = []
+    for it in items[:5]:
+        it2 = _clean_text(str(it))
+        it2 = _RE_ITEM_SAN.sub("", it2).strip()
+        if it2:
+            clean_items.append(it2[:60])
+    return sentiment, reason, clean_items
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding(model: str) -> Any:
+    """
+    tiktoken encoding for model, or None if unavailable (not installed / can't load).
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # unknown (newer) model name; current models share o200k_base
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return None
+    except Exception:
+        # encodings are downloaded on first use
+        return None
+
+
+def _truncate_body(body: str) -> str:
+    enc = _encoding(os.getenv("OPENAI_MODEL", DEFAULT_MODEL))
+    if enc is None:
+        if len(body) > MAX_BODY_CHARS:
+            return body[:MAX_BODY_CHARS] + "…"
+        return body
+    toks = enc.encode(body, disallowed_special=())
+    if len(toks) > MAX_BODY_TOKENS:
+        # a token cut can split a multi-byte char; drop the partial bytes, not U+FFFD
+        return enc.decode_bytes(toks[:MAX_BODY_TOKENS]).decode("utf-8", "ignore") + "…"
+    return body
+
+
+def _prepare_posts(posts: List[Dict[str, Any]]) -> Chunk:
+    """
+    Clean + truncate each post into (idx, title, body).
+    """
+    prepared: Chunk = []
+    for i, p in enumerate(posts):
+        title = _clean_text(p.get("title", ""))
+        body = _truncate_body(_clean_text(p.get("selftext", "")))
+        prepared.append((i, title, body))
+    return prepared
+
+
+def _chunked(prepared: Chunk) -> List[Chunk]:
+    return [prepared[start:start + BATCH_SIZE] for start in range(0, len(prepared), BATCH_SIZE)]
+
+
+def _request_body(subreddit: str, chunk: Chunk) -> Dict[str, Any]:
+    """
+    Responses API request body for one chunk of posts.
+    """
+    prompt = {
+        "subreddit": subreddit,
+        # chunk-local idx; _parse_results maps it back to the post
+        "posts": [{"idx": n, "title": title, "body": body} for n, (_, title, body) in enumerate(chunk)],
+    }
+    # Model can be changed via OPENAI_MODEL.
+    # Output is a small JSON object per post.
+    model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
+    body: Dict[str, Any] = {
+        "model": model,
+        "input": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(prompt, ensure_ascii=False)},
+        ],
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": "post_eval",
+                "schema": RESULTS_SCHEMA,
+                "strict": True,
+            },
+        },
+        "max_output_tokens": 120 * len(chunk),
+    }
+    if model.startswith(REASONING_MODEL_PREFIXES):
+        # keep reasoning short and leave it room, or the JSON gets truncated
+        body["reasoning"] = {"effort": "low"}
+        body["max_output_tokens"] += REASONING_TOKENS
+    return body
+
+
+def _parse_results(out_text: str, chunk: Chunk) -> Dict[int, Evaluation]:
+    """
+    Parse a schema-conforming {"results": [...]} reply for chunk, keyed by
+    post idx. Rows with an idx outside the chunk are dropped.
+    Raises KeyError/TypeError/ValueError on malformed (e.g. truncated) output
+    or when any post of the chunk is missing from the reply.
+    """
+    obj = _json_loads(out_text)
+    results: Dict[int, Evaluation] = {}
+    for row in obj["results"]:
+        n = _safe_int(row["idx"], -1)
+        if 0 <= n < len(chunk):
+            results[chunk[n][0]] = _sanitize_eval(row)
+    if len(results) < len(chunk):
+        raise ValueError(f"reply covers {len(results)} of {len(chunk)} posts")
+    return results
+
+
+async def _score_chunk(
+    client: AsyncOpenAI,
+    sem: asyncio.Semaphore,
+    subreddit: str,
+    chunk: Chunk,
+    service_tier: Optional[str] = None,
+) -> Dict[int, Evaluation]:
+    """
+    Score a chunk of (idx, title, body) in one request.
+    On a JSON parse failure (or posts missing from the reply) the chunk is
+    split in half and retried, down to single posts, which fall back to a
+    neutral score.
+    """
+    body = _request_body(subreddit, chunk)
+    if service_tier:
+        body["service_tier"] = service_tier
+
+    async with sem:
+        resp = await client.responses.create(**body)
+
+    # openai-python provides output_text convenience
+    out_text = (getattr(resp, "output_text", "") or "").strip()
+
+    try:
+        return _parse_results(out_text, chunk)
+    except (KeyError, TypeError, ValueError):
+        # Truncated or incomplete reply; retry smaller.
+        if len(chunk) > 1:
+            half = len(chunk) // 2
+            results: Dict[int, Evaluation] = {}
+            for part in await asyncio.gather(
+                _score_chunk(client, sem, subreddit, chunk[:half], service_tier),
+                _score_chunk(client, sem, subreddit, chunk[half:], service_tier),
+            ):
+                results.update(part)
+            return results
+        return {chunk[0][0]: (3, "JSON parse error.", [])}
+
+
+async def _score_chunks(
+    client: AsyncOpenAI,
+    subreddit: str,
+    chunks: List[Chunk],
+    service_tier: Optional[str] = None,
+) -> Tuple[Dict[int, Evaluation], List[BaseException]]:
+    """
+    Score chunks concurrently, up to OPENAI_CONCURRENCY requests in flight.
+    Returns (results, errors); posts of failed chunks are absent from results.
+    """
+    sem = asyncio.Semaphore(max(1, _safe_int(os.getenv("OPENAI_CONCURRENCY", "8"), 8)))
+    parts = await asyncio.gather(
+        *(_score_chunk(client, sem, subreddit, chunk, service_tier) for chunk in chunks),
+        return_exceptions=True,
+    )
+
+    results: Dict[int, Evaluation] = {}
+    errors: List[BaseException] = []
+    for chunk, part in zip(chunks, parts):
+        if isinstance(part, BaseException):
+            print(f"OpenAI request failed for {len(chunk)} posts: {part}")
+            errors.append(part)
             continue
-        dt = datetime.fromtimestamp(float(created_utc), tz=timezone.utc)
-        if dt >= cutoff:
-            out.append(p)
-    return out
-
-
-@dataclass
-class ScoredPost:
-    id: str
-    title: str
-    selftext: str
-    url: str
-    permalink: str
-    author: str
-    created_utc: float
-    num_comments: int
-    score: int
-    sentiment_1_5: int
-    sentiment_reason: str
-    requested_items: List[str]
-
-
-def openai_score_posts(client: OpenAI, subreddit: str, posts: List[Dict[str, Any]]) -> List[ScoredPost]:
-    """
-    Uses OpenAI to produce:
+        results.update(part)
+    return results, errors
+
+
+def _post_dict(
+    p: Dict[str, Any], title: str, body: str, sentiment: int, reason: str, items: List[str]
+) -> Dict[str, Any]:
+    """
+    One data/posts.ndjson record.
+    """
+    created_utc = float(p.get("created_utc", 0.0))
+    return {
+        "id": str(p.get("id", "")),
+        "title": title,
+        "selftext": body,
+        "url": str(p.get("url", "")),
+        "permalink": "https://www.reddit.com" + str(p.get("permalink", "")),
+        "author": str(p.get("author", "")),
+        "created_utc": created_utc,
+        "created_iso": datetime.fromtimestamp(created_utc, tz=timezone.utc).isoformat(),
+        "num_comments": _safe_int(p.get("num_comments"), 0),
+        "score": _safe_int(p.get("score"), 0),
+        "sentiment_1_5": sentiment,
+        "sentiment_reason": reason,
+        "requested_items": items,
+    }
+
+
+def _assemble(
+    posts: List[Dict[str, Any]], prepared: Chunk, results: Dict[int, Evaluation]
+) -> List[Dict[str, Any]]:
+    """
+    posts.ndjson records for posts that got a result; the rest are left out
+    (and so get retried next run rather than published with a made-up score).
+    """
+    scored: List[Dict[str, Any]] = []
+    for (i, title, body), p in zip(prepared, posts):
+        if i not in results:
+            continue
+        sentiment, reason, items = results[i]
+        scored.append(_post_dict(p, title, body, sentiment, reason, items))
+    return scored
+
+
+async def openai_score_posts(
+    client: AsyncOpenAI, subreddit: str, posts: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Uses OpenAI to produce, per post:
       - sentiment_1_5 (1..5)
       - short reason (<= 20 words)
       - requested_items (0..5 short noun phrases)
+
+    Posts are sent in chunks of BATCH_SIZE per request, with up to
+    OPENAI_CONCURRENCY requests in flight at once. Posts whose request
+    failed are dropped; if every request failed, the first error is raised.
     """
-    # Keep costs sane: we only send title + first N chars of body
-    MAX_BODY_CHARS = 1200
+    prepared = _prepare_posts(posts)
+    results, errors = await _score_chunks(client, subreddit, _chunked(prepared))
+    if errors and not results:
+        raise errors[0]
+    return _assemble(posts, prepared, results)
 
-    scored: List[ScoredPost] = []
 
-    system = (
-        "You are an analyst for a mobile game community. "
-        "Given a Reddit post, output STRICT JSON with keys: "
-        "sentiment_1_5 (integer 1..5), sentiment_reason (<=20 words), "
-        "requested_items (array of 0..5 short phrases). "
-        "Requested items = content the author is asking for (buff/nerf/add/remove/fix), "
-        "or the main items being discussed (maps, guns, operators, perks, modes, bugs). "
-        "If unclear, return an empty array for requested_items."
-    )
+def _response_text(body: Dict[str, Any]) -> str:
+    """
+    Concatenate output_text parts of a raw Responses API body
+    (batch output carries plain JSON, not SDK objects).
+    """
+    parts = []
+    for item in body.get("output", []) or []:
+        for c in item.get("content", []) or []:
+            if c.get("type") == "output_text":
+                parts.append(c.get("text", ""))
+    return "".join(parts).strip()
 
-    for p in posts:
-        title = _clean_text(p.get("title", ""))
-        body = _clean_text(p.get("selftext", ""))
-        if len(body) > MAX_BODY_CHARS:
-            body = body[:MAX_BODY_CHARS] + "…"
-
-        prompt = {
-            "subreddit": subreddit,
-            "title": title,
-            "body": body,
-        }
-
-        # Use Responses API. Model can be changed if you prefer cheaper.
-        # We keep max_output_tokens low; output is small JSON.
-        resp = client.responses.create(
-            model=os.getenv("OPENAI_MODEL", "gpt-5.2"),
-            input=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": json.dumps(prompt, ensure_ascii=False)},
-            ],
-            max_output_tokens=250,
-        )
-
-        # openai-python provides output_text convenience
-        out_text = getattr(resp, "output_text", "") or ""
-        out_text = out_text.strip()
-
-        # try to locate JSON object in the output
-        m = re.search(r"\{.*\}", out_text, flags=re.DOTALL)
-        if not m:
-            # fallback
-            sentiment = 3
-            reason = "No JSON parsed."
-            items = []
-        else:
+
+async def openai_batch_score_posts(
+    client: AsyncOpenAI, subreddit: str, posts: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Same output as openai_score_posts, but submitted through the OpenAI
+    Batch API (cheaper, slower). Chunks the batch does not return are
+    re-scored in real time, on the flex service tier if the model offers it.
+    """
+    prepared = _prepare_posts(posts)
+    chunks = _chunked(prepared)
+    if not chunks:
+        return []
+
+    lines = []
+    for n, chunk in enumerate(chunks):
+        lines.append(json.dumps({
+            "custom_id": f"chunk-{n}",
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": _request_body(subreddit, chunk),
+        }, ensure_ascii=False))
+    payload = ("\n".join(lines) + "\n").encode("utf-8")
+
+    batch_file = await client.files.create(file=("requests.jsonl", payload), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h",
+    )
+    print(f"Submitted batch {batch.id} ({len(chunks)} requests).")
+
+    timeout_s = _safe_int(os.getenv("OPENAI_BATCH_TIMEOUT", "7200"), 7200)
+    deadline = time.monotonic() + timeout_s
+    delay = 30.0
+    cancelling = False
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        if not cancelling and time.monotonic() >= deadline:
+            print(f"Batch {batch.id} still {batch.status} after {timeout_s}s; cancelling.")
+            # keep polling: a cancelled batch still yields (billed) partial output
+            batch = await client.batches.cancel(batch.id)
+            cancelling = True
+            delay = 10.0
+            continue
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, 300.0)
+        batch = await client.batches.retrieve(batch.id)
+
+    by_id = {f"chunk-{n}": chunk for n, chunk in enumerate(chunks)}
+    results: Dict[int, Evaluation] = {}
+    done = set()
+    if batch.output_file_id:
+        content = await client.files.content(batch.output_file_id)
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            row = _json_loads(line)
+            resp = row.get("response") or {}
+            chunk = by_id.get(row.get("custom_id"))
+            if resp.get("status_code") != 200 or chunk is None:
+                continue
             try:
-                obj = json.loads(m.group(0))
-                sentiment = _safe_int(obj.get("sentiment_1_5"), 3)
-                sentiment = max(1, min(5, sentiment))
-                reason = str(obj.get("sentiment_reason", "")).strip()[:200]
-                items = obj.get("requested_items", [])
-                if not isinstance(items, list):
-                    items = []
-                # sanitize phrases
-                clean_items = []
-                for it in items[:5]:
-                    it2 = _clean_text(str(it))
-                    it2 = re.sub(r"[^\w\s\-\+&'/]", "", it2).strip()
-                    if it2:
-                        clean_items.append(it2[:60])
-                items = clean_items
-            except Exception:
-                sentiment = 3
-                reason = "JSON parse error."
-                items = []
-
-        scored.append(
-            ScoredPost(
-                id=str(p.get("id", "")),
-                title=title,
-                selftext=body,
-                url=str(p.get("url", "")),
-                permalink="https://www.reddit.com" + str(p.get("permalink", "")),
-                author=str(p.get("author", "")),
-                created_utc=float(p.get("created_utc", 0.0)),
-                num_comments=_safe_int(p.get("num_comments"), 0),
-                score=_safe_int(p.get("score"), 0),
-                sentiment_1_5=sentiment,
-                sentiment_reason=reason,
-                requested_items=items,
-            )
-        )
+                results.update(_parse_results(_response_text(resp.get("body") or {}), chunk))
+            except (KeyError, TypeError, ValueError):
+                # leave it for the realtime fallback (which splits on parse errors)
+                continue
+            done.add(row.get("custom_id"))
 
-        # gentle pacing (helps avoid accidental API bursts)
-        time.sleep(0.2)
+    missing = [chunk for n, chunk in enumerate(chunks) if f"chunk-{n}" not in done]
+    if missing:
+        model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
+        tier = "flex" if model.startswith(FLEX_MODEL_PREFIXES) else None
+        print(f"Batch {batch.id} ended {batch.status}; re-scoring {len(missing)} chunks on {tier or 'default'} tier.")
+        fallback, errors = await _score_chunks(client, subreddit, missing, service_tier=tier)
+        if errors and not results and not fallback:
+            raise errors[0]
+        results.update(fallback)
 
-    return scored
+    return _assemble(posts, prepared, results)
 
 
-def build_word_freq(scored: List[ScoredPost]) -> Dict[str, int]:
+def tokens_from(text: str) -> List[str]:
+    """
+    Lowercased keyword tokens (no stopwords, numbers or short words).
+    Expects text already passed through _clean_text (URLs removed), which
+    is how title/selftext are stored on post records.
+    """
+    stop = _STOPWORDS
+    # quotes other than ' are already spaces after translate
+    parts = (t.strip("-'") for t in text.lower().translate(_XLAT).split())
+    return [t for t in parts if len(t) >= 3 and t not in stop and not t.isdigit()]
+
+
+def build_word_freq(scored: List[Dict[str, Any]]) -> Counter[str]:
     """
     Aggregate requested_items first (strong signal),
     then fall back to simple keyword extraction from titles/bodies.
     """
-    freq: Dict[str, int] = {}
-
-    def add(token: str, w: int = 1):
-        token = token.strip()
-        if not token:
-            return
-        freq[token] = freq.get(token, 0) + w
+    freq: Counter[str] = Counter()
 
     # 1) requested items (weighted)
     for sp in scored:
-        for it in sp.requested_items:
-            add(it.lower(), 3)
+        for it in sp["requested_items"]:
+            it = it.strip().lower()
+            if it:
+                freq[it] += 3
 
     # 2) lightweight keyword extraction (for coverage)
-    stop = set("""
-        the a an and or but if then else when while to of in on for with without is are was were be been being
-        i you he she they we it this that these those my your our their
-        codm cod mobile call duty callofdutymobile
-        pls please thanks thank
-        just like game gameplay player players
-        really very much
-    """.split())
-
-    def tokens_from(text: str) -> List[str]:
-        text = text.lower()
-        text = re.sub(r"https?://\S+", " ", text)
-        text = re.sub(r"[^a-z0-9\s\-\+&'/]", " ", text)
-        parts = re.split(r"\s+", text)
-        out = []
-        for t in parts:
-            t = t.strip("-'\"")
-            if len(t) < 3:
-                continue
-            if t in stop:
-                continue
-            if t.isdigit():
-                continue
-            out.append(t)
-        return out
-
     for sp in scored:
-        for t in tokens_from(sp.title):
-            add(t, 1)
-        for t in tokens_from(sp.selftext):
-            add(t, 1)
+        # one pass per post; the separator keeps title/body tokens apart
+        freq.update(tokens_from(sp["title"] + " \n " + sp["selftext"]))
 
     # prune extremely common single letters etc.
-    freq = {k: v for k, v in freq.items() if len(k) >= 3}
+    return Counter({k: v for k, v in freq.items() if len(k) >= 3})
 
-    return freq
+
+def load_cached_posts(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load a previous posts.ndjson keyed by post id. Missing file / bad lines are skipped.
+    Posts that only got a fallback score are left out so they get re-scored.
+    """
+    try:
+        with open(path, "rb") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return {}
+    cache: Dict[str, Dict[str, Any]] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            d = _json_loads(line)
+        except ValueError:
+            continue
+        if not isinstance(d, dict) or not d.get("id"):
+            continue
+        if d.get("sentiment_reason") in FALLBACK_REASONS:
+            continue
+        cache[str(d["id"])] = d
+    return cache
+
+
+def write_ndjson(path: str, rows: Iterable[Any]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        for row in rows:
+            f.write(_json_dumpb(row) + b"\n")
 
 
 def write_json(path: str, obj: Any):
     os.makedirs(os.path.dirname(path), exist_ok=True)
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
     with open(path, "w", encoding="utf-8") as f:
         json.dump(obj, f, ensure_ascii=False, indent=2)
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="score posts via the OpenAI Batch API (cheaper, can take minutes)",
+    )
+    args = parser.parse_args()
+
     load_dotenv()  # local only; in GitHub Actions env is passed separately
 
     subreddit = os.getenv("SUBREDDIT", "CallOfDutyMobile").strip()
@@ -296,46 +710,59 @@ def main():
     if not openai_key:
         raise SystemExit("OPENAI_API_KEY missing. Set it in env (GitHub Secret or scripts/.env).")
 
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    data_dir = os.path.join(root, "data")
+
     print(f"Fetching r/{subreddit} newest posts…")
-    raw_posts = fetch_reddit_new(subreddit=subreddit, limit=limit)
+    raw_posts = fetch_reddit_new(subreddit=subreddit, limit=limit, data_dir=data_dir)
     raw_posts = filter_by_age(raw_posts, max_age_hours=max_age_hours_i)
     print(f"Got {len(raw_posts)} posts after filters.")
 
-    client = OpenAI(api_key=openai_key)
+    # Reuse last run's scores for posts we've already seen; only the
+    # title/body go to the model, so just refresh the live counters.
+    cache = load_cached_posts(os.path.join(data_dir, "posts.ndjson"))
+    todo = [p for p in raw_posts if str(p.get("id", "")) not in cache]
+    print(f"Reusing {len(raw_posts) - len(todo)} cached posts, {len(todo)} to score.")
+
+    fresh: Dict[str, Dict[str, Any]] = {}
+    if todo:
+        client = AsyncOpenAI(api_key=openai_key)
+
+        print("Scoring sentiment + extracting requested items via OpenAI…")
+        score = openai_batch_score_posts if args.batch else openai_score_posts
+        fresh = {sp["id"]: sp for sp in asyncio.run(score(client, subreddit, todo))}
+        if fresh and all(sp["sentiment_reason"] in FALLBACK_REASONS for sp in fresh.values()):
+            raise SystemExit(
+                f"All {len(fresh)} scored posts came back unparseable (truncated output?); not publishing."
+            )
 
-    print("Scoring sentiment + extracting requested items via OpenAI…")
-    scored = openai_score_posts(client, subreddit, raw_posts)
+    # posts.ndjson records, in listing order
+    scored: List[Dict[str, Any]] = []
+    for p in raw_posts:
+        pid = str(p.get("id", ""))
+        sp = fresh.get(pid)
+        if sp is None:
+            if pid not in cache:
+                # its OpenAI request failed; retried next run
+                continue
+            sp = cache[pid]
+            sp["num_comments"] = _safe_int(p.get("num_comments"), sp.get("num_comments", 0))
+            sp["score"] = _safe_int(p.get("score"), sp.get("score", 0))
+        scored.append(sp)
 
-    # serialize posts
-    posts_out = []
-    for sp in scored:
-        posts_out.append(
-            {
-                "id": sp.id,
-                "title": sp.title,
-                "selftext": sp.selftext,
-                "url": sp.url,
-                "permalink": sp.permalink,
-                "author": sp.author,
-                "created_utc": sp.created_utc,
-                "created_iso": datetime.fromtimestamp(sp.created_utc, tz=timezone.utc).isoformat(),
-                "num_comments": sp.num_comments,
-                "score": sp.score,
-                "sentiment_1_5": sp.sentiment_1_5,
-                "sentiment_reason": sp.sentiment_reason,
-                "requested_items": sp.requested_items,
-            }
-        )
+    # posts the model gave nothing usable for would skew the stats; retried next run
+    scored = [sp for sp in scored if sp.get("sentiment_reason") not in FALLBACK_REASONS]
 
     freq = build_word_freq(scored)
 
     # top terms
-    top_terms = sorted(freq.items(), key=lambda kv: kv[1], reverse=True)[:150]
+    top_terms = freq.most_common(150)
     wordfreq_out = [{"term": k, "count": v} for k, v in top_terms]
 
     # summary
+    hist = Counter(sp["sentiment_1_5"] for sp in scored)
     if scored:
-        avg_sent = sum(sp.sentiment_1_5 for sp in scored) / len(scored)
+        avg_sent = sum(i * n for i, n in hist.items()) / len(scored)
     else:
         avg_sent = 0.0
 
@@ -344,24 +771,21 @@ def main():
         "post_count": len(scored),
         "generated_at_utc": _now_utc().isoformat(),
         "avg_sentiment": round(avg_sent, 3),
-        "sentiment_histogram": {
-            str(i): sum(1 for sp in scored if sp.sentiment_1_5 == i) for i in range(1, 6)
-        },
+        "sentiment_histogram": {str(i): hist[i] for i in range(1, 6)},
         "top_requested_items": wordfreq_out[:30],
     }
 
-    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    data_dir = os.path.join(root, "data")
-
-    write_json(os.path.join(data_dir, "posts.json"), posts_out)
+    write_ndjson(os.path.join(data_dir, "posts.ndjson"), scored)
     write_json(os.path.join(data_dir, "wordfreq.json"), wordfreq_out)
     write_json(os.path.join(data_dir, "summary.json"), summary)
 
     print("Wrote:")
-    print(f" - {os.path.join(data_dir, 'posts.json')}")
+    print(f" - {os.path.join(data_dir, 'posts.ndjson')}")
     print(f" - {os.path.join(data_dir, 'wordfreq.json')}")
     print(f" - {os.path.join(data_dir, 'summary.json')}")
 
+    _clean_text.cache_clear()
+
 
 if __name__ == "__main__":
     main()